@@ -8,8 +8,57 @@ from strategy.london_imbalance import LondonImbalanceStrategy
 from backtester.engine import BacktestEngine
 from data.download_data import download_eurusd_data
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+import itertools
 import json
 import os
+import sys
+
+# Default grid for run_sweep, built around the README's tuning suggestions
+SWEEP_GRID = {
+    'volume_multiplier': [1.5, 2.0],
+    'min_wick_pips': [6, 8, 10],
+    'min_body_pips': [4, 5, 6],
+    'stop_loss_pips': [15],
+    'tp1_pips': [20],
+    'tp2_pips': [30],
+}
+
+# README layout filled in by update_readme
+README_TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "README.template.md")
+
+# Status Assessment section, chosen by win rate
+STATUS_TRADEABLE = """
+✅ **TRADEABLE** - Strategy meets 70%+ win rate requirement
+
+This strategy is ready for live trading. The win rate and profit factor indicate a robust edge during London open sessions.
+"""
+
+STATUS_MARGINAL = """
+⚠️ **MARGINAL** - Consider optimization
+
+Win rate is acceptable but below target. Consider:
+- Increasing volume_multiplier to 2.0 for stricter filtering
+- Only trading first 90 minutes of London session
+- Focusing on round number levels only
+"""
+
+STATUS_NEEDS_WORK = """
+❌ **NEEDS WORK** - Optimize before live trading
+
+Current win rate is below acceptable threshold. Recommended actions:
+- Review individual trades in `backtest_trades.csv`
+- Adjust entry parameters (volume, wick size, etc.)
+- Consider additional filters or different timeframes
+"""
+
+# Price data shared with sweep workers (inherited for free under fork)
+_sweep_df = None
+
+# Indicator frames keyed by LondonImbalanceStrategy.indicator_params(),
+# computed once in run_sweep and shared with workers the same way
+_sweep_indicators = None
 
 def run_backtest():
     """Execute complete backtest workflow"""
@@ -41,12 +90,14 @@ def run_backtest():
         ema_length=20,
         stop_loss_pips=15,
         tp1_pips=20,
-        tp2_pips=30
+        tp2_pips=30,
+        signal_cooldown_bars=12
     )
     print("  ✓ Volume multiplier: 1.5x")
     print("  ✓ Min rejection wick: 8 pips")
     print("  ✓ Min confirmation body: 5 pips")
     print("  ✓ Stop loss: 15 pips | TP1: 20 pips | TP2: 30 pips")
+    print("  ✓ Signal cooldown: 12 bars")
     
     # Step 3: Detect signals
     print("\n[3/6] Scanning for entry signals...")
@@ -122,227 +173,117 @@ def run_backtest():
     
     return metrics
 
-def update_readme(metrics, status_emoji):
-    """Update README with latest backtest results"""
+def _init_sweep_worker(df, indicators):
+    """Store the shared price data and indicator frames in a sweep worker process"""
+    global _sweep_df, _sweep_indicators
+    _sweep_df = df
+    _sweep_indicators = indicators
+
+def _run_one(params):
+    """Backtest a single parameter combination and return its metrics"""
+    strategy = LondonImbalanceStrategy(**params)
+    indicators = _sweep_indicators[strategy.indicator_params()]
+    signals = strategy.detect_signals_from_indicators(indicators)
+    engine = BacktestEngine(initial_capital=3.0)
+    trades_df = engine.execute_trades(_sweep_df, signals)
+    return {**params, **engine.calculate_metrics(trades_df)}
+
+def run_sweep(param_grid=SWEEP_GRID, max_workers=None):
+    """
+    Backtest every combination in param_grid across a process pool
     
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
+    Args:
+        param_grid: Dict mapping strategy parameter names to lists of values
+        max_workers: Number of worker processes (defaults to CPU count)
+        
+    Returns:
+        DataFrame of parameters and metrics, best profit factor first
+    """
+    print("=" * 70)
+    print("LONDON OPEN IMBALANCE STRATEGY - PARAMETER SWEEP")
+    print("=" * 70)
     
-    readme = f"""# London Open Imbalance Strategy - Automated Backtest
-
-![Status](https://img.shields.io/badge/Status-{status_emoji}-blue)
-![Win Rate](https://img.shields.io/badge/Win_Rate-{metrics['win_rate']}%25-{'green' if metrics['win_rate'] >= 70 else 'orange' if metrics['win_rate'] >= 60 else 'red'})
-![Total Pips](https://img.shields.io/badge/Total_Pips-{metrics['total_pips']:+.0f}-{'green' if metrics['total_pips'] > 0 else 'red'})
-
-## 📊 Latest Backtest Results
-
-**Last Updated:** {timestamp}
-
-### Performance Metrics
-
-| Metric | Value |
-|--------|-------|
-| **Total Trades** | {metrics['total_trades']} |
-| **Winners** | {metrics['winners']} |
-| **Losers** | {metrics['losers']} |
-| **Win Rate** | **{metrics['win_rate']}%** |
-| **Total Pips** | **{metrics['total_pips']:+.1f}** |
-| **Avg Pips/Trade** | {metrics['avg_pips']:+.2f} |
-| **Avg Win** | +{metrics['avg_win_pips']:.1f} pips |
-| **Avg Loss** | {metrics['avg_loss_pips']:.1f} pips |
-| **Profit Factor** | {metrics['profit_factor']:.2f} |
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=60)
+    
+    try:
+        df = download_eurusd_data(
+            start_date.strftime("%Y-%m-%d"),
+            end_date.strftime("%Y-%m-%d")
+        )
+    except Exception as e:
+        print(f"Error downloading data: {e}")
+        return None
+    
+    names = list(param_grid)
+    combos = [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+    print(f"\nRunning {len(combos)} parameter combinations...")
+    
+    # Fork lets workers share the price and indicator frames without pickling them
+    if "fork" in mp.get_all_start_methods():
+        context = mp.get_context("fork")
+    else:
+        context = mp.get_context()
+    
+    # Stop/target and threshold parameters don't change the indicators, so
+    # compute one frame per distinct indicator_params() before forking
+    indicators = {}
+    for params in combos:
+        strategy = LondonImbalanceStrategy(**params)
+        key = strategy.indicator_params()
+        if key not in indicators:
+            indicators[key] = strategy.calculate_indicators(df)
+    print(f"  ✓ Computed {len(indicators)} indicator sets")
+    
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                             mp_context=context,
+                             initializer=_init_sweep_worker,
+                             initargs=(df, indicators)) as executor:
+        results = list(executor.map(_run_one, combos))
+    
+    results_df = pd.DataFrame(results).sort_values('profit_factor', ascending=False)
+    results_df.to_csv("sweep_results.csv", index=False)
+    
+    print("\nTop 5 parameter sets by profit factor:")
+    print(results_df.head(5).to_string(index=False))
+    print("\n  ✓ Sweep results saved: sweep_results.csv\n")
+    
+    return results_df
 
-### Status Assessment
-"""
+def update_readme(metrics, status_emoji):
+    """Update README with latest backtest results"""
     
     if metrics['win_rate'] >= 70:
-        readme += f"""
-✅ **TRADEABLE** - Strategy meets 70%+ win rate requirement
-
-This strategy is ready for live trading. The win rate and profit factor indicate a robust edge during London open sessions.
-"""
+        status_block = STATUS_TRADEABLE
+        win_rate_color = 'green'
     elif metrics['win_rate'] >= 60:
-        readme += f"""
-⚠️ **MARGINAL** - Consider optimization
-
-Win rate is acceptable but below target. Consider:
-- Increasing volume_multiplier to 2.0 for stricter filtering
-- Only trading first 90 minutes of London session
-- Focusing on round number levels only
-"""
+        status_block = STATUS_MARGINAL
+        win_rate_color = 'orange'
     else:
-        readme += f"""
-❌ **NEEDS WORK** - Optimize before live trading
-
-Current win rate is below acceptable threshold. Recommended actions:
-- Review individual trades in `backtest_trades.csv`
-- Adjust entry parameters (volume, wick size, etc.)
-- Consider additional filters or different timeframes
-"""
+        status_block = STATUS_NEEDS_WORK
+        win_rate_color = 'red'
     
-    readme += f"""
-
-## 📋 Strategy Overview
-
-**Trading Pair:** EURUSD  
-**Timeframe:** 5-minute  
-**Session:** London Open (3:00-6:00 AM EST / 8:00-11:00 AM UTC)
-
-### Entry Requirements (ALL 5 Must Be Met)
-
-1. **📍 Location Check**
-   - Price at round number (00 or 50 level) ±5 pips, OR
-   - Price at previous day high/low ±5 pips
-
-2. **📊 Volume Confirmation**
-   - Current bar volume > 1.5x the 20-period average
-   - Indicates institutional participation
-
-3. **🔄 Rejection Pattern**
-   - Previous candle shows 8+ pip wick at the level
-   - Demonstrates absorption/order flow imbalance
-
-4. **✅ Confirmation Candle**
-   - Current candle closes away from level
-   - Body size minimum 5 pips
-   - Price breaks above/below previous candle
-
-5. **📈 EMA Alignment**
-   - 20 EMA sloping in trade direction
-   - Price on correct side of EMA (above for longs, below for shorts)
-
-### Risk Management
-
-- **Stop Loss:** 15 pips
-- **Take Profit 1:** 20 pips (close 50% of position)
-- **Take Profit 2:** 30 pips (close remaining 50%)
-- **Risk/Reward:** 1:2 ratio minimum
-- **Max Time in Trade:** 5 hours (time stop)
-
-### Capital Management (for $3 account)
-
-- **Position Size:** 0.10 lots (10 micro lots)
-- **Risk per Trade:** 50% of account ($1.50)
-- **Stop Loss:** $1.50 loss if hit
-- **Take Profit:** $3.00 gain at TP2 (100% ROI per win)
-
-**Growth Path:**
-- $3 → $10: Need 3 wins (73% win rate gives 1 loss allowance)
-- $10 → $25: Reduce risk to 40% per trade
-- $25 → $50: Reduce risk to 30% per trade
-- $50 → $100: Reduce risk to 25% per trade
-
-## 🚀 Quick Start
-
-### Run Backtest Locally
-
-```bash
-# Install dependencies
-pip install -r requirements.txt
-
-# Run backtest
-python backtest_runner.py
-```
-
-### View Results
-
-- **Trade Log:** `backtest_trades.csv` - Individual trade details
-- **Metrics:** `backtest_metrics.json` - Performance summary
-- **This File:** `README.md` - Auto-updated with latest results
-
-## 📁 Project Structure
-
-```
-london-imbalance-backtest/
-├── data/
-│   ├── download_data.py      # EURUSD data fetcher
-│   └── eurusd_5m.csv         # Downloaded price data
-├── strategy/
-│   └── london_imbalance.py   # Strategy logic
-├── backtester/
-│   └── engine.py             # Trade execution engine
-├── .github/workflows/
-│   └── backtest.yml          # GitHub Actions automation
-├── backtest_runner.py        # Main script
-├── backtest_trades.csv       # Trade results
-├── backtest_metrics.json     # Performance metrics
-├── requirements.txt          # Python dependencies
-└── README.md                 # This file
-```
-
-## 🤖 Automated Testing
-
-This repository uses GitHub Actions to automatically run backtests:
-
-- ✅ **On every push** to main branch
-- ✅ **Daily at 12:00 PM UTC** (7:00 AM EST - after London session)
-- ✅ **On-demand** via workflow dispatch
-
-Results are automatically committed back to the repository.
-
-## 📊 Example Trades
-
-Recent winning trades (see `backtest_trades.csv` for full log):
-
-```
-Entry Time          | Dir  | Entry   | Exit    | Pips | Reason
---------------------|------|---------|---------|------|--------
-2026-01-15 09:30:00 | LONG | 1.0402  | 1.0432  | +30  | TP2
-2026-01-16 08:45:00 | LONG | 1.0450  | 1.0470  | +20  | TP1
-2026-01-17 10:15:00 | SHORT| 1.0398  | 1.0383  | +15  | TP1
-```
-
-## ⚙️ Parameter Optimization
-
-Current parameters can be adjusted in `backtest_runner.py`:
-
-```python
-strategy = LondonImbalanceStrategy(
-    volume_multiplier=1.5,    # Higher = fewer but cleaner signals
-    min_wick_pips=8,          # Minimum rejection size
-    min_body_pips=5,          # Minimum confirmation size
-    ema_length=20,            # EMA period
-    stop_loss_pips=15,        # Stop distance
-    tp1_pips=20,              # First target
-    tp2_pips=30               # Second target
-)
-```
-
-## 📈 Next Steps
-
-### If Win Rate ≥ 70% (Tradeable)
-1. Begin paper trading with FBS demo account
-2. Track 5-10 live trades to validate execution
-3. Start live trading with strict discipline
-
-### If Win Rate 60-69% (Marginal)
-1. Test with stricter filters (volume_multiplier=2.0)
-2. Reduce session window (first 90 minutes only)
-3. Focus on round numbers only
-
-### If Win Rate < 60% (Needs Work)
-1. Review losing trades for patterns
-2. Consider additional filters or rule adjustments
-3. Test different session times or pairs
-
-## 📝 License
-
-MIT License - Free to use and modify
-
-## 🤝 Contributing
-
-Feel free to fork, optimize parameters, and submit pull requests with improvements!
-
----
-
-**Disclaimer:** Past performance does not guarantee future results. Trade at your own risk. This is for educational purposes only.
-"""
+    values = {
+        **metrics,
+        'status_emoji': status_emoji,
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'),
+        'status_block': status_block,
+        'win_rate_color': win_rate_color,
+        'total_pips_color': 'green' if metrics['total_pips'] > 0 else 'red',
+    }
+    
+    with open(README_TEMPLATE, encoding="utf-8") as f:
+        readme = f.read().format_map(values)
     
-    with open("README.md", "w") as f:
+    with open("README.md", "w", encoding="utf-8") as f:
         f.write(readme)
 
 if __name__ == "__main__":
     try:
-        run_backtest()
+        if "--sweep" in sys.argv[1:]:
+            run_sweep()
+        else:
+            run_backtest()
     except Exception as e:
         print(f"\n❌ Error running backtest: {e}")
         raise
@@ -1,12 +1,27 @@
 import yfinance as yf
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 import os
+import time
+
+# Cached downloads younger than this are reused instead of re-downloading
+CACHE_MAX_AGE_SECONDS = 24 * 60 * 60
 
 def download_eurusd_data(start_date, end_date):
-    """Download EURUSD 5-minute data from Yahoo Finance"""
+    """Download EURUSD 5-minute data from Yahoo Finance, reusing a Parquet cache"""
     ticker = "EURUSD=X"
     
+    cache_file = f"data/eurusd_5m_{start_date}_{end_date}.parquet"
+    if os.path.exists(cache_file) and time.time() - os.path.getmtime(cache_file) < CACHE_MAX_AGE_SECONDS:
+        try:
+            df = pd.read_parquet(cache_file)
+            print(f"Loaded {len(df)} cached bars from {cache_file}")
+            return df
+        except Exception as e:
+            # Truncated or corrupt cache: fall through to a fresh download
+            print(f"Ignoring unreadable cache {cache_file}: {e}")
+    
     print(f"Downloading {ticker} from {start_date} to {end_date}...")
     
     try:
@@ -25,6 +40,10 @@ def download_eurusd_data(start_date, end_date):
         df = df.dropna()
         df.columns = [col.lower() for col in df.columns]
         
+        # Prices stay float64: float32 rounding moves whole-pip prices across
+        # the wick/body and round-number thresholds. Volume fits in uint32.
+        df['volume'] = df['volume'].astype(np.uint32)
+        
         print(f"Downloaded {len(df)} bars")
         print(f"Date range: {df.index[0]} to {df.index[-1]}")
         
@@ -36,6 +55,9 @@ def download_eurusd_data(start_date, end_date):
         df.to_csv(output_file)
         print(f"Saved to {output_file}")
         
+        # Cache for repeated runs
+        df.to_parquet(cache_file, compression="snappy")
+        
         return df
         
     except Exception as e:
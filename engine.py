@@ -4,16 +4,127 @@ Backtest engine for executing trades and calculating performance metrics
 
 import pandas as pd
 import numpy as np
+from numba_compat import njit, HAVE_NUMBA
+
+# Exit reason codes returned by scan_exits
+STOP_LOSS, TP2, TP1, TIME_STOP = 0, 1, 2, 3
+EXIT_REASONS = ('STOP_LOSS', 'TP2', 'TP1', 'TIME_STOP')
+
+
+@njit(cache=True)
+def scan_exits(entry_idx, stop_loss, tp1, tp2, dir_long, highs, lows, closes, max_bars):
+    """
+    Scan forward from each entry to find the first exit bar
+    
+    Stop loss is checked before TP2, and TP2 before TP1, on every bar.
+    Trades with no exit inside max_bars close at the last bar's close.
+    
+    Returns:
+        Tuple of (exit_price, exit_reason_code, bars_in_trade) arrays
+    """
+    n_signals = len(entry_idx)
+    n_bars = len(closes)
+    exit_price = np.empty(n_signals, dtype=closes.dtype)
+    exit_code = np.empty(n_signals, dtype=np.int64)
+    bars_in_trade = np.zeros(n_signals, dtype=np.int64)
+    
+    for j in range(n_signals):
+        start = entry_idx[j]
+        exit_code[j] = TIME_STOP
+        exit_price[j] = closes[min(start + max_bars - 1, n_bars - 1)]
+        
+        for k in range(1, max_bars):
+            i = start + k
+            if i >= n_bars:
+                break
+            bars_in_trade[j] += 1
+            
+            if dir_long[j]:
+                sl_hit = lows[i] <= stop_loss[j]
+                tp2_hit = highs[i] >= tp2[j]
+                tp1_hit = highs[i] >= tp1[j]
+            else:
+                sl_hit = highs[i] >= stop_loss[j]
+                tp2_hit = lows[i] <= tp2[j]
+                tp1_hit = lows[i] <= tp1[j]
+            
+            if sl_hit:
+                exit_price[j] = stop_loss[j]
+                exit_code[j] = STOP_LOSS
+                break
+            elif tp2_hit:
+                exit_price[j] = tp2[j]
+                exit_code[j] = TP2
+                break
+            elif tp1_hit:
+                exit_price[j] = tp1[j]
+                exit_code[j] = TP1
+                break
+    
+    return exit_price, exit_code, bars_in_trade
+
+
+def scan_exits_numpy(entry_idx, stop_loss, tp1, tp2, dir_long, highs, lows, closes, max_bars):
+    """
+    NumPy version of scan_exits, used when Numba is unavailable
+    
+    Each trade's window is checked with whole-slice comparisons and the
+    first hit bar is found with argmax, instead of looping bar by bar.
+    Stop loss still wins over TP2, and TP2 over TP1, on the same bar.
+    """
+    n_signals = len(entry_idx)
+    n_bars = len(closes)
+    exit_price = np.empty(n_signals, dtype=closes.dtype)
+    exit_code = np.empty(n_signals, dtype=np.int64)
+    bars_in_trade = np.empty(n_signals, dtype=np.int64)
+    
+    for j in range(n_signals):
+        start = entry_idx[j]
+        hi = highs[start + 1:start + max_bars]
+        lo = lows[start + 1:start + max_bars]
+        
+        if dir_long[j]:
+            sl_hit = lo <= stop_loss[j]
+            tp2_hit = hi >= tp2[j]
+            tp1_hit = hi >= tp1[j]
+        else:
+            sl_hit = hi >= stop_loss[j]
+            tp2_hit = lo <= tp2[j]
+            tp1_hit = lo <= tp1[j]
+        
+        any_hit = sl_hit | tp2_hit | tp1_hit
+        if not any_hit.any():
+            exit_price[j] = closes[min(start + max_bars - 1, n_bars - 1)]
+            exit_code[j] = TIME_STOP
+            bars_in_trade[j] = len(hi)
+            continue
+        
+        k = any_hit.argmax()
+        bars_in_trade[j] = k + 1
+        if sl_hit[k]:
+            exit_price[j] = stop_loss[j]
+            exit_code[j] = STOP_LOSS
+        elif tp2_hit[k]:
+            exit_price[j] = tp2[j]
+            exit_code[j] = TP2
+        else:
+            exit_price[j] = tp1[j]
+            exit_code[j] = TP1
+    
+    return exit_price, exit_code, bars_in_trade
+
 
 class BacktestEngine:
-    def __init__(self, initial_capital=3.0):
+    def __init__(self, initial_capital=3.0, pip_value=0.0001):
         """
         Initialize backtest engine
         
         Args:
             initial_capital: Starting capital in USD
+            pip_value: Price size of one pip (EURUSD)
         """
         self.initial_capital = initial_capital
+        self.pip_value = pip_value
         
     def execute_trades(self, df, signals):
         """
@@ -26,86 +137,53 @@ class BacktestEngine:
         Returns:
             DataFrame with trade results
         """
-        trades = []
-        
-        for signal in signals:
-            entry_idx = signal['entry_index']
-            entry_price = signal['entry_price']
-            stop_loss = signal['stop_loss']
-            tp1 = signal['tp1']
-            tp2 = signal['tp2']
-            direction = signal['direction']
-            
-            # Look forward to find exit
-            exit_price = None
-            exit_reason = None
-            bars_in_trade = 0
-            max_bars = 60  # Max 5 hours (60 * 5min bars)
-            
-            for i in range(entry_idx + 1, min(entry_idx + max_bars, len(df))):
-                bar = df.iloc[i]
-                bars_in_trade += 1
-                
-                if direction == 'LONG':
-                    # Check stop loss first
-                    if bar['low'] <= stop_loss:
-                        exit_price = stop_loss
-                        exit_reason = 'STOP_LOSS'
-                        break
-                    # Check TP2
-                    elif bar['high'] >= tp2:
-                        exit_price = tp2
-                        exit_reason = 'TP2'
-                        break
-                    # Check TP1
-                    elif bar['high'] >= tp1:
-                        exit_price = tp1
-                        exit_reason = 'TP1'
-                        break
-                
-                elif direction == 'SHORT':
-                    # Check stop loss first
-                    if bar['high'] >= stop_loss:
-                        exit_price = stop_loss
-                        exit_reason = 'STOP_LOSS'
-                        break
-                    # Check TP2
-                    elif bar['low'] <= tp2:
-                        exit_price = tp2
-                        exit_reason = 'TP2'
-                        break
-                    # Check TP1
-                    elif bar['low'] <= tp1:
-                        exit_price = tp1
-                        exit_reason = 'TP1'
-                        break
-            
-            # If no exit found, close at time stop
-            if exit_price is None:
-                exit_price = df.iloc[min(entry_idx + max_bars - 1, len(df) - 1)]['close']
-                exit_reason = 'TIME_STOP'
-            
-            # Calculate P&L in pips
-            if direction == 'LONG':
-                pips = (exit_price - entry_price) / 0.0001
-            else:
-                pips = (entry_price - exit_price) / 0.0001
-            
-            win = pips > 0
-            
-            trades.append({
-                'entry_time': signal['timestamp'],
-                'direction': direction,
-                'entry_price': entry_price,
-                'exit_price': exit_price,
-                'exit_reason': exit_reason,
-                'pips': pips,
-                'win': win,
-                'bars_in_trade': bars_in_trade,
-                'level_type': signal['level_type']
-            })
-        
-        return pd.DataFrame(trades)
+        highs = df['high'].to_numpy()
+        lows = df['low'].to_numpy()
+        closes = df['close'].to_numpy()
+        max_bars = 60  # Max 5 hours (60 * 5min bars)
+        
+        # Pack signals into pre-allocated arrays for the exit kernel, matching
+        # the price dtype
+        n = len(signals)
+        entry_idx = np.empty(n, dtype=np.int64)
+        entry_price = np.empty(n, dtype=highs.dtype)
+        stop_loss = np.empty(n, dtype=highs.dtype)
+        tp1 = np.empty(n, dtype=highs.dtype)
+        tp2 = np.empty(n, dtype=highs.dtype)
+        dir_long = np.empty(n, dtype=np.bool_)
+        direction = np.empty(n, dtype='U5')
+        level_type = np.empty(n, dtype='U8')
+        
+        for j, signal in enumerate(signals):
+            entry_idx[j] = signal['entry_index']
+            entry_price[j] = signal['entry_price']
+            stop_loss[j] = signal['stop_loss']
+            tp1[j] = signal['tp1']
+            tp2[j] = signal['tp2']
+            dir_long[j] = signal['direction'] == 'LONG'
+            direction[j] = signal['direction']
+            level_type[j] = signal['level_type']
+        
+        # Interpreted, the bar-by-bar kernel is slower than slice-wide argmax
+        scan = scan_exits if HAVE_NUMBA else scan_exits_numpy
+        exit_price, exit_codes, bars_in_trade = scan(
+            entry_idx, stop_loss, tp1, tp2, dir_long, highs, lows, closes, max_bars
+        )
+        
+        # Calculate P&L in pips
+        pips = np.where(dir_long, exit_price - entry_price, entry_price - exit_price) / self.pip_value
+        
+        return pd.DataFrame({
+            'entry_time': df.index[entry_idx],
+            'direction': direction,
+            'entry_price': entry_price,
+            'exit_price': exit_price,
+            'exit_reason': np.array(EXIT_REASONS)[exit_codes],
+            'pips': pips,
+            'win': pips > 0,
+            'bars_in_trade': bars_in_trade,
+            'level_type': level_type
+        })
     
     def calculate_metrics(self, trades_df):
         """
@@ -131,28 +209,33 @@ class BacktestEngine:
                 'avg_bars_in_trade': 0
             }
         
-        total_trades = len(trades_df)
-        winners = trades_df[trades_df['win'] == True]
-        losers = trades_df[trades_df['win'] == False]
+        # Single pass over the pips array; results are plain Python numbers
+        # so they stay JSON-serialisable
+        pips = trades_df['pips'].to_numpy(dtype=np.float64)
+        win_mask = pips > 0
+        
+        total_trades = len(pips)
+        n_winners = int(win_mask.sum())
+        n_losers = total_trades - n_winners
         
-        win_rate = (len(winners) / total_trades) * 100 if total_trades > 0 else 0
-        total_pips = trades_df['pips'].sum()
-        avg_pips = trades_df['pips'].mean()
+        win_rate = (n_winners / total_trades) * 100
+        total_pips = pips.sum()
+        avg_pips = total_pips / total_trades
         
         # Profit factor
-        gross_profit = winners['pips'].sum() if len(winners) > 0 else 0
-        gross_loss = abs(losers['pips'].sum()) if len(losers) > 0 else 0
+        gross_profit = pips[win_mask].sum()
+        gross_loss = -pips[~win_mask].sum()
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
         
         return {
             'total_trades': total_trades,
-            'winners': len(winners),
-            'losers': len(losers),
+            'winners': n_winners,
+            'losers': n_losers,
             'win_rate': round(win_rate, 2),
-            'total_pips': round(total_pips, 2),
-            'avg_pips': round(avg_pips, 2),
-            'avg_win_pips': round(winners['pips'].mean(), 2) if len(winners) > 0 else 0,
-            'avg_loss_pips': round(losers['pips'].mean(), 2) if len(losers) > 0 else 0,
-            'profit_factor': round(profit_factor, 2),
-            'avg_bars_in_trade': round(trades_df['bars_in_trade'].mean(), 1) if len(trades_df) > 0 else 0
+            'total_pips': round(float(total_pips), 2),
+            'avg_pips': round(float(avg_pips), 2),
+            'avg_win_pips': round(float(gross_profit / n_winners), 2) if n_winners > 0 else 0,
+            'avg_loss_pips': round(float(-gross_loss / n_losers), 2) if n_losers > 0 else 0,
+            'profit_factor': round(float(profit_factor), 2),
+            'avg_bars_in_trade': round(float(trades_df['bars_in_trade'].to_numpy().mean()), 1)
         }
@@ -11,6 +11,92 @@ Entry requirements (ALL 5 must be met):
 
 import pandas as pd
 import numpy as np
+import bottleneck as bn
+from numba_compat import njit
+
+
+def _shift(values, fill_value):
+    """Shift an array forward by one bar, filling the first slot"""
+    shifted = np.empty_like(values)
+    shifted[0:1] = fill_value
+    shifted[1:] = values[:-1]
+    return shifted
+
+
+@njit(cache=True, fastmath=True)
+def _ema(values, span):
+    """Exponential moving average, equivalent to ewm(span, adjust=False)"""
+    k = 2.0 / (span + 1)
+    out = np.empty_like(values)
+    if len(values) == 0:
+        return out
+    out[0] = values[0]
+    for i in range(1, len(values)):
+        out[i] = k * values[i] + (1 - k) * out[i - 1]
+    return out
+
+
+@njit(cache=True)
+def _scan_signals(close, open_, high, low, volume_spike, upper_wick_pips, lower_wick_pips,
+                  body_pips, ema_slope, ema_20, prev_day_high, prev_day_low, near_round,
+                  candidates, tol, min_wick, min_body):
+    """
+    Evaluate all 5 entry conditions for each candidate bar in a single fused pass
+    
+    Runs single-threaded: there are only ~2k session candidates, and sweep
+    workers would otherwise each start a thread per CPU. fastmath is left
+    off because the previous-day levels and EMA slope contain NaNs that
+    must compare False.
+    
+    Returns:
+        Tuple of (long_mask, short_mask) boolean arrays
+    """
+    n = len(close)
+    long_mask = np.zeros(n, dtype=np.bool_)
+    short_mask = np.zeros(n, dtype=np.bool_)
+    
+    for j in range(len(candidates)):
+        i = candidates[j]
+        
+        # ===== CONDITION 1: LOCATION =====
+        at_key_level = (near_round[i] or
+                        abs(close[i] - prev_day_high[i]) < tol or
+                        abs(close[i] - prev_day_low[i]) < tol)
+        
+        # ===== CONDITION 2: VOLUME SPIKE (previous bar) =====
+        if not (at_key_level and volume_spike[i - 1]):
+            continue
+        
+        # ===== CONDITION 4: CONFIRMATION CANDLE (body size) =====
+        if body_pips[i] < min_body:
+            continue
+        
+        # ===== LONG: rejection, confirmation and EMA alignment =====
+        if (lower_wick_pips[i - 1] >= min_wick and
+                close[i] > open_[i] and close[i] > high[i - 1] and
+                ema_slope[i] > 0 and close[i] > ema_20[i]):
+            long_mask[i] = True
+        
+        # ===== SHORT: rejection, confirmation and EMA alignment =====
+        elif (upper_wick_pips[i - 1] >= min_wick and
+                close[i] < open_[i] and close[i] < low[i - 1] and
+                ema_slope[i] < 0 and close[i] < ema_20[i]):
+            short_mask[i] = True
+    
+    return long_mask, short_mask
+
+
+@njit(cache=True)
+def _cooldown(mask, bars):
+    """Suppress signals fewer than `bars` bars after the previous kept signal"""
+    out = np.zeros_like(mask)
+    last = -bars - 1
+    for i in range(len(mask)):
+        if mask[i] and i - last >= bars:
+            out[i] = True
+            last = i
+    return out
+
 
 class LondonImbalanceStrategy:
     def __init__(self, 
@@ -20,7 +106,8 @@ class LondonImbalanceStrategy:
                  ema_length=20,
                  stop_loss_pips=15,
                  tp1_pips=20,
-                 tp2_pips=30):
+                 tp2_pips=30,
+                 signal_cooldown_bars=12):
         """
         Initialize strategy parameters
         
@@ -32,6 +119,8 @@ class LondonImbalanceStrategy:
             stop_loss_pips: Stop loss distance in pips
             tp1_pips: First take profit target in pips
             tp2_pips: Second take profit target in pips
+            signal_cooldown_bars: Bars to wait after a signal before taking
+                another in the same direction (0 disables)
         """
         self.volume_multiplier = volume_multiplier
         self.min_wick_pips = min_wick_pips
@@ -40,6 +129,7 @@ class LondonImbalanceStrategy:
         self.stop_loss_pips = stop_loss_pips
         self.tp1_pips = tp1_pips
         self.tp2_pips = tp2_pips
+        self.signal_cooldown_bars = signal_cooldown_bars
         self.pip_value = 0.0001  # EURUSD pip size
         
     def pips_to_price(self, pips):
@@ -54,57 +144,91 @@ class LondonImbalanceStrategy:
         """
         Check if timestamp is during London session (3am-6am EST)
         In UTC: 8am-11am
+        
+        Also accepts a DatetimeIndex, returning a boolean array computed
+        from its hour array in one pass.
         """
-        hour = timestamp.hour
-        return 8 <= hour < 11
+        hour = np.asarray(timestamp.hour)
+        return (hour >= 8) & (hour < 11)
     
     def is_near_round_number(self, price, tolerance_pips=5):
         """
         Check if price is near round number (00 or 50 level)
         
+        Branchless, so it works elementwise on a whole price array as
+        well as on a single price.
+        
         Args:
-            price: Current price
+            price: Current price or array of prices
             tolerance_pips: How close to level counts as "near"
         """
-        price_in_pips = int(price / self.pip_value)
+        price_in_pips = (np.asarray(price, dtype=np.float64) / self.pip_value).astype(np.int64)
         last_two_digits = price_in_pips % 100
         
-        # Check 00 level
-        if abs(last_two_digits) <= tolerance_pips or abs(last_two_digits - 100) <= tolerance_pips:
-            return True
-        
-        # Check 50 level
-        if abs(last_two_digits - 50) <= tolerance_pips:
-            return True
-        
-        return False
+        # 00 level (from either side) or 50 level
+        return ((last_two_digits <= tolerance_pips) |
+                (last_two_digits >= 100 - tolerance_pips) |
+                (np.abs(last_two_digits - 50) <= tolerance_pips))
     
     def calculate_indicators(self, df):
         """Calculate all technical indicators needed for strategy"""
-        df = df.copy()
+        open_ = df['open'].to_numpy()
+        high = df['high'].to_numpy()
+        low = df['low'].to_numpy()
+        close = df['close'].to_numpy()
+        volume = df['volume'].to_numpy()
         
         # EMA
-        df['ema_20'] = df['close'].ewm(span=self.ema_length, adjust=False).mean()
-        df['ema_slope'] = df['ema_20'].diff()
+        ema_20 = _ema(close, self.ema_length)
+        ema_slope = ema_20 - _shift(ema_20, np.nan)
         
         # Volume analysis
-        df['volume_ma'] = df['volume'].rolling(window=20).mean()
-        df['volume_spike'] = df['volume'] > (df['volume_ma'] * self.volume_multiplier)
+        # bottleneck rejects windows longer than the data; rolling(20).mean()
+        # left such short frames all-NaN, so keep that
+        if len(volume) < 20:
+            volume_ma = np.full(len(volume), np.nan)
+        else:
+            volume_ma = bn.move_mean(volume.astype(np.float64), window=20, min_count=20)
+        volume_spike = volume > (volume_ma * self.volume_multiplier)
         
         # Candle analysis
-        df['body'] = abs(df['close'] - df['open'])
-        df['upper_wick'] = df['high'] - df[['open', 'close']].max(axis=1)
-        df['lower_wick'] = df[['open', 'close']].min(axis=1) - df['low']
+        body = np.abs(close - open_)
+        upper_wick = high - np.maximum(open_, close)
+        lower_wick = np.minimum(open_, close) - low
         
-        df['body_pips'] = self.price_to_pips(df['body'])
-        df['upper_wick_pips'] = self.price_to_pips(df['upper_wick'])
-        df['lower_wick_pips'] = self.price_to_pips(df['lower_wick'])
+        # Previous day high/low. The FX week opens Sunday evening, so weekend
+        # bars are folded into Friday's session; Monday then references
+        # Friday plus the Sunday open rather than a short Sunday stub
+        dates = df.index.normalize()
+        dates = dates - pd.to_timedelta(np.maximum(dates.dayofweek - 4, 0), unit='D')
+        prev_day_high = df['high'].groupby(dates).max().shift(1).reindex(dates).to_numpy()
+        prev_day_low = df['low'].groupby(dates).min().shift(1).reindex(dates).to_numpy()
         
-        # Previous day high/low (288 5-min bars = 1 day)
-        df['prev_day_high'] = df['high'].shift(1).rolling(window=288, min_periods=1).max()
-        df['prev_day_low'] = df['low'].shift(1).rolling(window=288, min_periods=1).min()
+        # Assemble all indicator columns in one frame rather than inserting
+        # them one at a time into a copy of df
+        indicators = pd.DataFrame({
+            'ema_20': ema_20,
+            'ema_slope': ema_slope,
+            'volume_ma': volume_ma,
+            'volume_spike': volume_spike,
+            'body': body,
+            'upper_wick': upper_wick,
+            'lower_wick': lower_wick,
+            'body_pips': self.price_to_pips(body),
+            'upper_wick_pips': self.price_to_pips(upper_wick),
+            'lower_wick_pips': self.price_to_pips(lower_wick),
+            'prev_day_high': prev_day_high,
+            'prev_day_low': prev_day_low,
+            # Location mask
+            'near_round': self.is_near_round_number(close),
+        }, index=df.index)
         
-        return df
+        # Replace any indicator columns already on df so the call is idempotent
+        return pd.concat([df.drop(columns=indicators.columns, errors='ignore'), indicators], axis=1)
+    
+    def indicator_params(self):
+        """Parameters that calculate_indicators output depends on"""
+        return (self.ema_length, self.volume_multiplier)
     
     def detect_signals(self, df):
         """
@@ -113,69 +237,80 @@ class LondonImbalanceStrategy:
         Returns:
             List of signal dictionaries with entry details
         """
-        df = self.calculate_indicators(df)
-        signals = []
-        
-        # Need warmup period for indicators
-        for i in range(100, len(df)):
-            row = df.iloc[i]
-            prev_row = df.iloc[i-1]
-            
-            # Skip if not London session
-            if not self.is_london_session(row.name):
-                continue
-            
-            # ===== CONDITION 1: LOCATION =====
-            at_round_number = self.is_near_round_number(row['close'])
-            at_prev_day_high = abs(row['close'] - row['prev_day_high']) < self.pips_to_price(5)
-            at_prev_day_low = abs(row['close'] - row['prev_day_low']) < self.pips_to_price(5)
-            
-            at_key_level = at_round_number or at_prev_day_high or at_prev_day_low
-            
-            if not at_key_level:
-                continue
-            
-            # ===== CONDITION 2: VOLUME SPIKE =====
-            if not prev_row['volume_spike']:
-                continue
-            
-            # ===== CONDITION 3: REJECTION PATTERN =====
-            bullish_rejection = prev_row['lower_wick_pips'] >= self.min_wick_pips
-            bearish_rejection = prev_row['upper_wick_pips'] >= self.min_wick_pips
-            
-            # ===== CONDITION 4: CONFIRMATION CANDLE =====
-            strong_body = row['body_pips'] >= self.min_body_pips
-            bullish_confirm = row['close'] > row['open'] and row['close'] > prev_row['high']
-            bearish_confirm = row['close'] < row['open'] and row['close'] < prev_row['low']
-            
-            # ===== CONDITION 5: EMA ALIGNMENT =====
-            ema_bullish = row['ema_slope'] > 0 and row['close'] > row['ema_20']
-            ema_bearish = row['ema_slope'] < 0 and row['close'] < row['ema_20']
-            
-            # ===== LONG SIGNAL =====
-            if (bullish_rejection and bullish_confirm and strong_body and ema_bullish):
-                signals.append({
-                    'timestamp': row.name,
-                    'direction': 'LONG',
-                    'entry_price': row['close'],
-                    'stop_loss': row['close'] - self.pips_to_price(self.stop_loss_pips),
-                    'tp1': row['close'] + self.pips_to_price(self.tp1_pips),
-                    'tp2': row['close'] + self.pips_to_price(self.tp2_pips),
-                    'level_type': 'Round' if at_round_number else 'Prev Day',
-                    'entry_index': i
-                })
-            
-            # ===== SHORT SIGNAL =====
-            elif (bearish_rejection and bearish_confirm and strong_body and ema_bearish):
-                signals.append({
-                    'timestamp': row.name,
-                    'direction': 'SHORT',
-                    'entry_price': row['close'],
-                    'stop_loss': row['close'] + self.pips_to_price(self.stop_loss_pips),
-                    'tp1': row['close'] - self.pips_to_price(self.tp1_pips),
-                    'tp2': row['close'] - self.pips_to_price(self.tp2_pips),
-                    'level_type': 'Round' if at_round_number else 'Prev Day',
-                    'entry_index': i
-                })
+        return self.detect_signals_from_indicators(self.calculate_indicators(df))
+    
+    def detect_signals_from_indicators(self, df):
+        """
+        Detect entry signals on a frame already returned by calculate_indicators
+        
+        Lets callers such as parameter sweeps reuse one indicator frame for
+        every strategy with the same indicator_params().
+        
+        Returns:
+            List of signal dictionaries with entry details
+        """
+        # Hoist parameter lookups and pip conversions out of the mask math
+        tol = self.pips_to_price(5)
+        sl_offset = self.pips_to_price(self.stop_loss_pips)
+        tp1_offset = self.pips_to_price(self.tp1_pips)
+        tp2_offset = self.pips_to_price(self.tp2_pips)
+        min_wick = self.min_wick_pips
+        min_body = self.min_body_pips
+        
+        close = df['close'].to_numpy()
+        open_ = df['open'].to_numpy()
+        high = df['high'].to_numpy()
+        low = df['low'].to_numpy()
+        ema_20 = df['ema_20'].to_numpy()
+        ema_slope = df['ema_slope'].to_numpy()
+        volume_spike = df['volume_spike'].to_numpy()
+        body_pips = df['body_pips'].to_numpy()
+        upper_wick_pips = df['upper_wick_pips'].to_numpy()
+        lower_wick_pips = df['lower_wick_pips'].to_numpy()
+        near_round = df['near_round'].to_numpy()
+        prev_day_high = df['prev_day_high'].to_numpy()
+        prev_day_low = df['prev_day_low'].to_numpy()
+        timestamps = df.index
+        
+        # Only London session bars past the indicator warmup are candidates
+        london_session = self.is_london_session(df.index)
+        candidates = np.flatnonzero(london_session & (np.arange(len(df)) >= 100))
+        
+        long_mask, short_mask = _scan_signals(
+            close, open_, high, low, volume_spike, upper_wick_pips, lower_wick_pips,
+            body_pips, ema_slope, ema_20, prev_day_high, prev_day_low, near_round,
+            candidates, tol, min_wick, min_body
+        )
+        
+        # Drop repeat signals from the same setup on consecutive bars
+        long_idx = np.flatnonzero(_cooldown(long_mask, self.signal_cooldown_bars))
+        short_idx = np.flatnonzero(_cooldown(short_mask, self.signal_cooldown_bars))
+        
+        # ===== LONG SIGNALS =====
+        signals = [{
+            'timestamp': timestamps[i],
+            'direction': 'LONG',
+            'entry_price': close[i],
+            'stop_loss': close[i] - sl_offset,
+            'tp1': close[i] + tp1_offset,
+            'tp2': close[i] + tp2_offset,
+            'level_type': 'Round' if near_round[i] else 'Prev Day',
+            'entry_index': i
+        } for i in long_idx]
+        
+        # ===== SHORT SIGNALS =====
+        signals += [{
+            'timestamp': timestamps[i],
+            'direction': 'SHORT',
+            'entry_price': close[i],
+            'stop_loss': close[i] + sl_offset,
+            'tp1': close[i] - tp1_offset,
+            'tp2': close[i] - tp2_offset,
+            'level_type': 'Round' if near_round[i] else 'Prev Day',
+            'entry_index': i
+        } for i in short_idx]
+        
+        # Keep signals in chronological order
+        signals.sort(key=lambda signal: signal['entry_index'])
         
         return signals
@@ -0,0 +1,18 @@
+"""
+Optional Numba support shared by the strategy and backtest engine
+
+When numba cannot be imported, njit becomes a no-op decorator so the same
+array kernels run as plain Python loops, and HAVE_NUMBA lets callers pick
+a faster NumPy path where one exists.
+"""
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func